@@ -1,35 +1,18 @@
 from typing import Callable, Dict, Sequence, Set, Tuple, Union
-from functools import wraps, partial
+from functools import lru_cache, wraps, partial
 from collections import defaultdict
-import contextlib
-import itertools as it
 
 import jax
-import jax.lax as lax
 import jax.numpy as jnp
 import jax.tree_util as jtu
 
-from jax._src.util import safe_map, safe_zip
+from jax._src.util import safe_map
 import jax._src.core as core
 
 from .primitives import elemental_rules
 from .sparse.tensor import get_num_muls, get_num_adds, _assert_sparse_tensor_consistency
 from .sparse.utils import zeros_like, get_largest_tensor
 
-# from jax._src import linear_util as lu
-# from jax._src.util import unzip2, weakref_lru_cache
-# from jax._src.api_util import argnums_partial, lru_cache
-# import jax._src.interpreters.partial_eval as pe
-# from jax._src import source_info_util
-
-
-from jax.tree_util import tree_flatten
-from jax._src.api_util import flatten_fun_nokwargs
-from jax._src import dispatch
-
-# map = safe_map
-# zip = safe_zip
-# elemental_rules = {}
 
 def tree_allclose(tree1, tree2, equal_nan: bool = False) -> bool:
     allclose = lambda a, b: jnp.allclose(a, b, equal_nan=equal_nan, atol=1e-5, rtol=1e-4)
@@ -37,134 +20,6 @@ def tree_allclose(tree1, tree2, equal_nan: bool = False) -> bool:
     return jtu.tree_reduce(jnp.logical_and, is_equal)
 
 
-# class CCETracer(core.Tracer):
-#     __slots__ = ["primal", "elemental"]
-#     def __init__(self, trace, primal, elemental):
-#         self._trace = trace
-#         self.primal = primal
-#         self.elemental = elemental
-        
-#     @property
-#     def aval(self):
-#         return core.get_aval(self.primal)
-    
-#     def full_lower(self):
-#         return core.full_lower(self.primal)
-    
-
-# class CCETrace(core.Trace):
-
-#     def pure(self, val):
-#         print("pure:", val)
-#         return CCETracer(self, val, 0.)
-    
-#     def lift(self, val):
-#         print("lift:", val)
-#         return CCETracer(self, val, 0.5)
-    
-#     def sublift(self, val):
-#         print("sublift:", val)
-#         return CCETracer(self, val.primal, val.elemental)
-    
-#     def process_primitive(self, primitive, tracers, params):
-#         print()
-#         print("PPP### primitive:", primitive)
-#         print("### tracers:", tracers)
-#         elemental_rule = elemental_rules.get(primitive)
-#         out_primals, out_elementals = elemental_rule([t.primal for t in tracers], **params)
-
-#         print("### out_elementals:", out_elementals)
-#         if primitive.multiple_results:
-#             out_tracers = [CCETracer(self, p, out_elementals) for p in out_primals]
-#         else:
-#             out_tracers = CCETracer(self, out_primals, out_elementals)
-#         print("### out_tracers:", out_tracers)
-#         return out_tracers # CCETracer(self, out_primals, out_elementals)
-
-
-# def jacve(fun: Callable, order=None, argnums=None) -> Callable:
-#     @wraps(fun)
-#     def jacfun(*args, **kwargs):
-#         f = lu.wrap_init(fun)
-#         f_jac = cce(f)
-#         print("args", args)
-#         return f_jac.call_wrapped(args, (0, 0))
-#     return jacfun
-
-
-# def cce(fun: lu.WrappedFun, transform_stack=True):
-#     jac_fn = ccefun(cce_subtrace(fun), transform_stack)
-#     return jac_fn
-
-# # first arg is always static arg for lu.transformation
-# @lu.transformation
-# def ccefun(transform_stack, primals, elementals):
-#     print("***primals:", primals)
-#     print("***elementals:", elementals)
-#     # NOTE: Do we have to register the `transform_name_stack` somewhere?
-#     ctx = (source_info_util.transform_name_stack("cce") if transform_stack
-#             else contextlib.nullcontext())
-#     with core.new_main(CCETrace) as main, ctx:
-#         out_primals, out_elementals = yield (main, primals, elementals), {}
-#         del main
-#     yield out_primals, out_elementals
-
-
-# @lu.transformation
-# def cce_subtrace(main, primals, elementals):
-#     trace = CCETrace(main, core.cur_sublevel())
-#     for x in list(primals):
-#         if isinstance(x, core.Tracer):
-#             if x._trace.level >= trace.level:
-#                 raise core.escaped_tracer_error(
-#                     x, f"Tracer from a higher level: {x} in trace {trace}")
-#             assert x._trace.level < trace.level
-
-#     print("///primals:", primals)
-#     print("///trace:", trace)
-#     # this is the piece that causes all the trouble
-#     in_tracers = [CCETracer(trace, x, 0) for x in primals]
-#     print("///in_tracers:", list(in_tracers))
-#     ans = yield in_tracers, {}
-#     # ans = [CCETracer(trace, x, 0) for x in ans]
-#     print("///ans:", ans)
-#     # NOTE: at this point somehow the tracer levels are incorrect, so 
-#     # an automatic lift() is applied to the primal values, which kills the 
-#     # derivatives
-#     out_tracers = map(trace.full_raise, ans)
-#     out_tracers = list(out_tracers)
-#     print("///out_tracers:", list(out_tracers))
-#     yield unzip2([(out_tracer.primal, out_tracer.elemental) 
-#                     for out_tracer in out_tracers])
-
-
-# def cce_jaxpr(jaxpr: core.ClosedJaxpr) -> tuple[core.ClosedJaxpr]:
-#     return _cce_jaxpr(jaxpr)
-
-
-# @weakref_lru_cache
-# def _cce_jaxpr(jaxpr):
-#     f = lu.wrap_init(core.jaxpr_as_fun(jaxpr))
-#     f_cce = f_cce_traceable(cce(f, transform_stack=False))
-#     elemental_avals = [aval for aval in jaxpr.in_avals]
-#     avals_in = list(it.chain(jaxpr.in_avals, elemental_avals))
-#     print("avals_in:", avals_in)
-#     jaxpr_out, avals_out, literals_out, () = pe.trace_to_jaxpr_dynamic(f_cce, avals_in)
-#     return core.ClosedJaxpr(jaxpr_out, literals_out)
-
-
-# @lu.transformation
-# def f_cce_traceable(*primals_and_elementals):
-#     print("primals_and_elementals:", primals_and_elementals)
-#     num_primals = len(primals_and_elementals) // 2
-#     primals = primals_and_elementals[:num_primals]
-#     elementals = primals_and_elementals[num_primals:]
-#     out_primals, out_elementals = yield (primals, elementals), {}
-#     print("out_primals:", out_primals)
-#     print("out_elementals:", out_elementals)
-#     yield list(out_primals) + list(out_elementals)
-
-
 EliminationOrder = Union[Sequence[int], str]
 ComputationalGraph = Dict[core.Var, Dict[core.Var, jnp.ndarray]]
 
@@ -204,12 +59,31 @@ def jacve(fun: Callable,
     Returns:
         Callable: The function that returns the Jacobian of `fun`.
     """
+    # Retracing `fun` is pure overhead when the Jacobian function is called
+    # repeatedly with arguments of the same shape and dtype, e.g. inside a
+    # training loop, so traced jaxprs are cached per argument signature. The
+    # cache is bounded since every entry pins a full jaxpr; past the limit the
+    # oldest signature is evicted first.
+    jaxpr_cache = {}
+    max_cache_size = 256
+
     @wraps(fun)
     def jacfun(*args, **kwargs):
 
         # TODO Make repackaging work properly with one input value only
         flattened_args, in_tree = jtu.tree_flatten(args)
-        closed_jaxpr = jax.make_jaxpr(fun)(*flattened_args, **kwargs)
+        if kwargs:
+            closed_jaxpr = jax.make_jaxpr(fun)(*flattened_args, **kwargs)
+        else:
+            # Avals are hashable and encode shape, dtype and weak type, so
+            # tracing sees exactly what the cache key distinguishes
+            signature = tuple(core.get_aval(arg) for arg in flattened_args)
+            closed_jaxpr = jaxpr_cache.get(signature)
+            if closed_jaxpr is None:
+                closed_jaxpr = jax.make_jaxpr(fun)(*flattened_args)
+                if len(jaxpr_cache) >= max_cache_size:
+                    del jaxpr_cache[next(iter(jaxpr_cache))]
+                jaxpr_cache[signature] = closed_jaxpr
 
         out = vertex_elimination_jaxpr(closed_jaxpr.jaxpr, 
                                         order, 
@@ -258,7 +132,12 @@ def _iota_shape(jaxpr: core.Jaxpr, argnums: Sequence[int]) -> jnp.ndarray:
     """
     largest_input = get_largest_tensor([jaxpr._invars[arg] for arg in argnums])
     largest_output = get_largest_tensor(jaxpr._outvars)
-        
+    if core.trace_state_clean():
+        return _materialize_iota(largest_output, largest_input)
+    return _build_iota(largest_output, largest_input)
+
+
+def _build_iota(largest_output: int, largest_input: int) -> jnp.ndarray:
     # TODO check if this is meaningful
     if largest_input == 1 and largest_output == 1:
         return None
@@ -267,7 +146,16 @@ def _iota_shape(jaxpr: core.Jaxpr, argnums: Sequence[int]) -> jnp.ndarray:
     elif largest_input == 1:
         return jnp.ones((largest_output, 1))
     else:
-        return jnp.eye(max(largest_output, largest_input), largest_input) 
+        return jnp.eye(max(largest_output, largest_input), largest_input)
+
+
+# The iota matrix only depends on the two sizes and is never mutated, so eager
+# evaluations share one cached copy across jacve calls instead of reallocating
+# it for every Jacobian evaluation. Under an active trace the matrix is rebuilt
+# as a staged op instead: caching there would leak a tracer into later traces,
+# and eager materialization would allocate a matrix that XLA otherwise fuses
+# away.
+_materialize_iota = lru_cache(_build_iota)
         
         
 def unload_post_transforms(post, pre, iota):
@@ -302,8 +190,9 @@ def _eliminate_vertex(vertex: int,
                         jaxpr: core.Jaxpr, 
                         graph: ComputationalGraph, 
                         transpose_graph: ComputationalGraph, 
-                        iota: jnp.ndarray, 
-                        vo_vertices: Set[core.Var]) -> Tuple[int, int]:
+                        iota: jnp.ndarray,
+                        vo_vertices: Set[core.Var],
+                        count_ops: bool = False) -> Tuple[int, int]:
     """
     Function that eliminates a vertex from the computational graph.
     everything that has a _val in its name is a `SparseTensor` object
@@ -321,6 +210,8 @@ def _eliminate_vertex(vertex: int,
         iota (jnp.ndarray): A Kronecker delta/unit matrix which is helpful when
                             materializing sparse tensors.
         vo_vertices (Set[core.Var]): A `set` containing all the output vertices.
+        count_ops (bool, optional): Count the number of operations performed
+                                    during the elimination. Defaults to `False`.
 
     Returns:
         Tuple[int, int]: The number of multiplications and additions that were
@@ -332,15 +223,21 @@ def _eliminate_vertex(vertex: int,
     """
     eqn = jaxpr.eqns[vertex-1]
     num_mul, num_add = 0, 0
-    for out_edge in graph[eqn.outvars[0]].keys():
-        post_val = graph[eqn.outvars[0]][out_edge].copy()
-        for in_edge in transpose_graph[eqn.outvars[0]].keys():
-            pre_val = transpose_graph[eqn.outvars[0]][in_edge].copy()
-            
+    # The adjacency dicts of the eliminated vertex are looked up once. Since the
+    # graph is acyclic there are no self-loops, so the writes below never touch
+    # these two dicts and iterating them directly is safe.
+    out_edges = graph[eqn.outvars[0]]
+    in_edges = transpose_graph[eqn.outvars[0]]
+    for out_edge, post_val in out_edges.items():
+        for in_edge, pre_val in in_edges.items():
+
             # TODO implement a process that discards unnecessary edges from the computation
-            
-            # Handle stuff like reshape, squeeze etc.            
+
+            # Handle stuff like reshape, squeeze etc.
             # Apply Jacobian transforms where applicable
+            # NOTE: only the working values are copied here; the tensors stored
+            # in the graph are never mutated below, so copying them as well just
+            # doubles the number of deepcopies per edge pair.
             _pre_val = pre_val.copy()
             _post_val = post_val.copy()
 
@@ -355,10 +252,11 @@ def _eliminate_vertex(vertex: int,
                 _pre_val = unload_pre_transforms(post_val, pre_val, iota)
                                 
             # Multiply the two values of the edges if applicable
-            if pre_val.val is not None and post_val.val is not None:     
+            if pre_val.val is not None and post_val.val is not None:
                 edge_outval = _post_val * _pre_val
-                num_mul += get_num_muls(_post_val, _pre_val)
-                    
+                if count_ops:
+                    num_mul += get_num_muls(_post_val, _pre_val)
+
             elif pre_val.val is not None:
                 edge_outval = _pre_val  
             else:
@@ -399,8 +297,9 @@ def _eliminate_vertex(vertex: int,
 
                 _assert_sparse_tensor_consistency(edge_outval)
                 edge_outval += _edge
-                num_add += get_num_adds(edge_outval, _edge)
-                
+                if count_ops:
+                    num_add += get_num_adds(edge_outval, _edge)
+
             _assert_sparse_tensor_consistency(edge_outval)
             # print("Edge_outval:", edge_outval)
             graph[in_edge][out_edge] = edge_outval
@@ -408,9 +307,9 @@ def _eliminate_vertex(vertex: int,
                 
     # Cleanup of input and output edges
     if vertex not in vo_vertices:
-        for in_vertex in transpose_graph[eqn.outvars[0]].keys():
+        for in_vertex in in_edges.keys():
             del graph[in_vertex][eqn.outvars[0]]
-    for out_vertex in graph[eqn.outvars[0]].keys():    
+    for out_vertex in out_edges.keys():
         del transpose_graph[out_vertex][eqn.outvars[0]]
     
     # Cleanup the eliminated vertex
@@ -440,19 +339,27 @@ def _checkify_order(order: EliminationOrder,
     Returns:
         EliminationOrder: A valid elimination order.
     """
+    # Checking membership against a set instead of the outvars list keeps this
+    # linear in the number of equations for large graphs
+    outvar_set = set(var for var in jaxpr.outvars if isinstance(var, core.Var))
     if type(order) is str:
         if order == "forward" or order == "fwd":
-            return [i for i, eqn in enumerate(jaxpr.eqns, start=1) 
-                    if eqn.outvars[0] not in jaxpr.outvars or i in vo_vertices]
+            return [i for i, eqn in enumerate(jaxpr.eqns, start=1)
+                    if eqn.outvars[0] not in outvar_set or i in vo_vertices]
         elif order == "reverse" or order == "rev":
-            return [i for i, eqn in enumerate(jaxpr.eqns, start=1) 
-                    if eqn.outvars[0] not in jaxpr.outvars or i in vo_vertices][::-1]
+            return [i for i, eqn in enumerate(jaxpr.eqns, start=1)
+                    if eqn.outvars[0] not in outvar_set or i in vo_vertices][::-1]
         else:
             raise ValueError(f"{order} is not a valid order identifier!")
     else:
-        vertex_set = set([i for i, eqn in enumerate(jaxpr.eqns, start=1) 
-                    if eqn.outvars[0] not in jaxpr.outvars or i in vo_vertices])
-    
+        # Custom orders frequently come out of a solver as a device or NumPy
+        # array. The vertices index Python lists and dicts downstream, so they
+        # are converted to native ints once here instead of paying for
+        # item-by-item device lookups during the elimination sweep.
+        order = [int(vertex) for vertex in order]
+        vertex_set = set([i for i, eqn in enumerate(jaxpr.eqns, start=1)
+                    if eqn.outvars[0] not in outvar_set or i in vo_vertices])
+
         set_from_order = set(order)
         missing_vertices = vertex_set.difference(set_from_order)
         if len(missing_vertices) > 0:
@@ -522,6 +429,11 @@ def _build_graph(jaxpr: core.Jaxpr,
     safe_map(write, jaxpr.invars, args)
     safe_map(write, jaxpr.constvars, consts)
 
+    # Var equality is identity-based, so a set gives the same membership
+    # semantics as scanning the outvars list for every invar of every equation.
+    # Literals are skipped since they can never match a Var.
+    outvar_set = set(var for var in jaxpr._outvars if isinstance(var, core.Var))
+
     # NOTE: this is essentially the tracing part. Probably should write a proper
     # tracing system with lift etc. for better compatibility with JAX
     # Loop though elemental partials and create an abstract representation of
@@ -534,7 +446,7 @@ def _build_graph(jaxpr: core.Jaxpr,
                 counter += 1
                     
         for invar in eqn.invars:
-            if invar in jaxpr._outvars:
+            if isinstance(invar, core.Var) and invar in outvar_set:
                 vertex = var_id[invar]
                 vo_vertices.add(vertex)
                 
@@ -585,7 +497,6 @@ def _prune_graph(graph: ComputationalGraph,
 
     TODO: Implement some unit tests for pruning. Maybe disable it for now?
     """
-    has_dead_vertices = True
     for i, invar in enumerate(jaxpr.invars):
         if i not in argnums:
             for in_edge in transpose_graph[invar].keys():
@@ -597,28 +508,35 @@ def _prune_graph(graph: ComputationalGraph,
             del transpose_graph[invar]
             # print("Pruned input variable:", invar)
         
-    already_deleted = []
-    while has_dead_vertices:
-        to_delete = []
-        for eqn in jaxpr.eqns:
-            ov = eqn.outvars[0]
-            if ov not in jaxpr.outvars and ov not in already_deleted:
-                if len(graph[ov]) == 0 or len(transpose_graph[ov]) == 0:
-                    to_delete.append(ov) 
-                    
-        if len(to_delete) > 0:
-            for ov in to_delete:
-                for in_edge in transpose_graph[ov].keys():
-                    del graph[in_edge][ov]
-                for out_edge in graph[ov].keys():   
-                    del transpose_graph[out_edge][ov]   
-                    
-                del graph[ov]
-                del transpose_graph[ov] 
-                # print("Pruned output variable:", ov)
-            already_deleted.extend(to_delete)
-        else:
-            has_dead_vertices = False
+    # Dead vertices are collected in a single pass over the equations and then
+    # propagated along the affected edges with a worklist. This way every
+    # vertex is visited once instead of rescanning the whole jaxpr until no
+    # dead vertex is found anymore.
+    outvar_set = set(var for var in jaxpr.outvars if isinstance(var, core.Var))
+    intermediates = set(eqn.outvars[0] for eqn in jaxpr.eqns
+                        if eqn.outvars[0] not in outvar_set)
+    to_delete = [ov for ov in intermediates
+                if len(graph[ov]) == 0 or len(transpose_graph[ov]) == 0]
+    already_deleted = set()
+    while to_delete:
+        ov = to_delete.pop()
+        if ov in already_deleted:
+            continue
+        already_deleted.add(ov)
+        for in_edge in transpose_graph[ov].keys():
+            del graph[in_edge][ov]
+            if in_edge in intermediates and in_edge not in already_deleted \
+                and len(graph[in_edge]) == 0:
+                to_delete.append(in_edge)
+        for out_edge in graph[ov].keys():
+            del transpose_graph[out_edge][ov]
+            if out_edge in intermediates and out_edge not in already_deleted \
+                and len(transpose_graph[out_edge]) == 0:
+                to_delete.append(out_edge)
+
+        del graph[ov]
+        del transpose_graph[ov]
+        # print("Pruned output variable:", ov)
 
 
 def vertex_elimination_jaxpr(jaxpr: core.Jaxpr, 
@@ -679,7 +597,8 @@ def vertex_elimination_jaxpr(jaxpr: core.Jaxpr,
     counts = []
     order = _checkify_order(order, jaxpr, vo_vertices)
     for vertex in order:
-        num_mul, num_add = _eliminate_vertex(vertex, jaxpr, graph, transpose_graph, iota, vo_vertices)
+        num_mul, num_add = _eliminate_vertex(vertex, jaxpr, graph, transpose_graph,
+                                            iota, vo_vertices, count_ops=count_ops)
         if count_ops:
             counts.append((num_mul, num_add))
             num_muls += num_mul
@@ -700,14 +619,14 @@ def vertex_elimination_jaxpr(jaxpr: core.Jaxpr,
                             tensor = transform.apply(tensor, iota)
                     graph[invar][outvar] = tensor
     
-    # Collect outputs  
-    if sparse_representation:   
+    # Collect outputs
+    if sparse_representation:
         jac_vals = [graph[invar][outvar]
-                    if outvar in list(graph[invar].keys()) else None
+                    if outvar in graph[invar] else None
                     for outvar in jaxpr.outvars for invar in jaxpr_invars]
     else:
-        jac_vals = [graph[invar][outvar].dense(iota) 
-                    if outvar in list(graph[invar].keys()) else zeros_like(outvar, invar)
+        jac_vals = [graph[invar][outvar].dense(iota)
+                    if outvar in graph[invar] else zeros_like(outvar, invar)
                     for outvar in jaxpr.outvars for invar in jaxpr_invars]
         
     # Restructure Jacobians for more complicated pytrees
@@ -719,7 +638,8 @@ def vertex_elimination_jaxpr(jaxpr: core.Jaxpr,
     if count_ops:
         # TODO: this needs to be reworked, aux should contain the primal values
         # so that we can compute stuff like loss_and_grad
-        order_counts = [(int(o), int(c[0])) for o, c in zip(order, counts)]
+        # Both the vertices and the op counts are native Python ints already
+        order_counts = [(o, c[0]) for o, c in zip(order, counts)]
         aux = {"num_muls": num_muls, 
                 "num_adds": num_adds, 
                 "order_counts": order_counts}
@@ -73,7 +73,6 @@ def eqx_jacve(fun: Callable,
         # TODO Make repackaging work properly with one input value only
         in_tree = jtu.tree_structure(args)
         closed_jaxpr, _, _ = filter_make_jaxpr(fun)(*args, **kwargs)
-        print(closed_jaxpr.jaxpr)
 
         x, *args = args
         flattened_x, _ = jtu.tree_flatten(x)
@@ -4,8 +4,9 @@ from tqdm import tqdm
 
 import matplotlib.pyplot as plt
 
+import numpy as np
+
 import jax
-import jax.numpy as jnp
 
 from chex import Array
 
@@ -18,7 +19,7 @@ def measure(f: Callable,
             args: Sequence[Array],
             samplesize: int = 1000,
             use_vmap: bool = True,
-            quantiles: Array = jnp.array([0.025, 0.975])) -> Sequence[int]:
+            quantiles: Array = np.array([0.025, 0.975])) -> Sequence[int]:
     measurements = []
     vmap_f = jax.vmap(f, in_axes=[0]*len(args)) if use_vmap is True else f
     jit_f = jax.jit(vmap_f)
@@ -36,10 +37,10 @@ def measure(f: Callable,
     del jit_f
     
     # Exclude first few measurements due to JIT compilation
-    measurements = jnp.array(measurements[10:])
-    median = jnp.median(measurements)
-    err = jnp.quantile(measurements, quantiles) - median
-    return jnp.array(measurements[10:]), median, err
+    measurements = np.array(measurements[10:])
+    median = np.median(measurements)
+    err = np.quantile(measurements, quantiles) - median
+    return measurements, median, err
 
 
 def measure_execution_time(f: Callable, 
@@ -65,7 +66,7 @@ def measure_execution_time(f: Callable,
         dt = timer() - st
         return dt
         
-    measurements = [measure([arg for arg in args])*1000 for i in tqdm(range(samplesize))]
+    measurements = [measure(args)*1000 for i in tqdm(range(samplesize))]
     if print_results:
         print(measurements)
         
@@ -73,43 +74,43 @@ def measure_execution_time(f: Callable,
     del grad_f
     
     # Exclude first measurements due to JIT compilation
-    return jnp.array(measurements[10:])
+    return np.array(measurements[10:])
 
 
-def measure_execution_time_with_jax(f: Callable, 
+def measure_execution_time_with_jax(f: Callable,
                                     args: Sequence[Array],
-                                    samplesize: int = 1000) -> Sequence[int]:
+                                    samplesize: int = 1000,
+                                    use_vmap: bool = True) -> Sequence[int]:
     """
     TODO docstring
     """
     fwd_measurements, rev_measurements = [], []
     argnums = list(range(len(args)))
-    vmap_f = jax.vmap(f, in_axes=[0]*len(args))
-    
+    vmap_f = jax.vmap(f, in_axes=[0]*len(args)) if use_vmap is True else f
+
     fwd_f = jax.jit(jax.jacfwd(vmap_f, argnums=argnums))
     rev_f = jax.jit(jax.jacrev(vmap_f, argnums=argnums))
-    
-    # print(grad_f(*[arg for arg in args]))
+
     def measure(xs):
         st = timer()
         out = fwd_f(*xs)
         jax.block_until_ready(out)
         dt = timer() - st
         return dt
-        
-    fwd_measurements = [measure([arg for arg in args])*1000 for i in tqdm(range(samplesize))]
-        
+
+    fwd_measurements = [measure(args)*1000 for i in tqdm(range(samplesize))]
+
     def measure(xs):
         st = timer()
         out = rev_f(*xs)
         jax.block_until_ready(out)
         dt = timer() - st
         return dt
-        
-    rev_measurements = [measure([arg for arg in args])*1000 for i in tqdm(range(samplesize))]
+
+    rev_measurements = [measure(args)*1000 for i in tqdm(range(samplesize))]
     
     # Exclude first measurement due to JIT compilation
-    return jnp.array(fwd_measurements[10:]), jnp.array(rev_measurements[10:])
+    return np.array(fwd_measurements[10:]), np.array(rev_measurements[10:])
 
 
 def plot_performance(f: Callable,
@@ -118,7 +119,7 @@ def plot_performance(f: Callable,
                     mM_order: Order,
                     fname: str,
                     samplesize: int = 1000,
-                    quantiles: Array = jnp.array([0.025, 0.975]),
+                    quantiles: Array = np.array([0.025, 0.975]),
                     caption: str ="different modes",
                     use_vmap: bool = True) -> None:
     """
@@ -129,17 +130,17 @@ def plot_performance(f: Callable,
     rev_measurements = measure_execution_time(f, args, "rev", samplesize=samplesize, use_vmap=use_vmap)
     fwd_measurements = measure_execution_time(f, args, "fwd", samplesize=samplesize, use_vmap=use_vmap)
     
-    fwd_med = jnp.median(fwd_measurements)
-    rev_med = jnp.median(rev_measurements)
-    mM_med = jnp.median(mM_measurements)
-    cc_med = jnp.median(cc_measurements)
+    fwd_med = np.median(fwd_measurements)
+    rev_med = np.median(rev_measurements)
+    mM_med = np.median(mM_measurements)
+    cc_med = np.median(cc_measurements)
     
     print(f"fwd median: {fwd_med}, rev median: {rev_med}, mM median: {mM_med}, cc median: {cc_med}")
     
-    fwd_err = jnp.quantile(fwd_measurements, quantiles) - fwd_med
-    rev_err = jnp.quantile(rev_measurements, quantiles) - rev_med
-    mM_err = jnp.quantile(mM_measurements, quantiles) - mM_med
-    cc_err = jnp.quantile(cc_measurements, quantiles) - cc_med
+    fwd_err = np.quantile(fwd_measurements, quantiles) - fwd_med
+    rev_err = np.quantile(rev_measurements, quantiles) - rev_med
+    mM_err = np.quantile(mM_measurements, quantiles) - mM_med
+    cc_err = np.quantile(cc_measurements, quantiles) - cc_med
     
     print(f"fwd err: {fwd_err}, rev err: {rev_err}, mM err: {mM_err}, cc err: {cc_err}")
     
@@ -148,9 +149,9 @@ def plot_performance(f: Callable,
     plt.rcParams.update({"font.size": 14})  
     
     modes = ["forward", "reverse", "Markowitz", "AlphaGrad"]
-    x_pos = jnp.arange(0, len(modes))
-    runtimes = jnp.stack([fwd_med, rev_med, mM_med, cc_med])
-    runtime_errors = jnp.stack([fwd_err, rev_err, mM_err, cc_err], axis=1)*jnp.array([[-1.], [1.]])
+    x_pos = np.arange(0, len(modes))
+    runtimes = np.stack([fwd_med, rev_med, mM_med, cc_med])
+    runtime_errors = np.stack([fwd_err, rev_err, mM_err, cc_err], axis=1)*np.array([[-1.], [1.]])
 
     ax.bar(x_pos, runtimes, yerr=runtime_errors, align="center", alpha=0.5, 
             ecolor="black", color="#6096f6", capsize=10)
@@ -174,7 +175,7 @@ def plot_performance_and_jax(f: Callable,
                     mM_order: Order,
                     fname: str,
                     samplesize: int = 100,
-                    quantiles: Array = jnp.array([0.025, 0.975]),
+                    quantiles: Array = np.array([0.025, 0.975]),
                     caption: str ="different modes") -> None:
     """
     TODO docstring
@@ -186,34 +187,34 @@ def plot_performance_and_jax(f: Callable,
     
     jax_fwd_measurements, jax_rev_measurements = measure_execution_time_with_jax(f, args, samplesize=samplesize)
     
-    fwd_med = jnp.median(fwd_measurements)
-    rev_med = jnp.median(rev_measurements)
-    cc_med = jnp.median(cc_measurements)
-    mM_med = jnp.median(mM_measurements)
+    fwd_med = np.median(fwd_measurements)
+    rev_med = np.median(rev_measurements)
+    cc_med = np.median(cc_measurements)
+    mM_med = np.median(mM_measurements)
     
     print(f"fwd median: {fwd_med}, rev median: {rev_med}, cc median: {cc_med}, mM median: {mM_med}")
     
-    jax_fwd_med = jnp.median(jax_fwd_measurements)
-    jax_rev_med = jnp.median(jax_rev_measurements)
+    jax_fwd_med = np.median(jax_fwd_measurements)
+    jax_rev_med = np.median(jax_rev_measurements)
     
-    fwd_err = jnp.quantile(fwd_measurements, quantiles) - fwd_med
-    rev_err = jnp.quantile(rev_measurements, quantiles) - rev_med
-    cc_err = jnp.quantile(cc_measurements, quantiles) - cc_med
-    mM_err = jnp.quantile(mM_measurements, quantiles) - mM_med
+    fwd_err = np.quantile(fwd_measurements, quantiles) - fwd_med
+    rev_err = np.quantile(rev_measurements, quantiles) - rev_med
+    cc_err = np.quantile(cc_measurements, quantiles) - cc_med
+    mM_err = np.quantile(mM_measurements, quantiles) - mM_med
     
     print(f"fwd err: {fwd_err}, rev err: {rev_err}, cc err: {cc_err}, mM err: {mM_err}")
     
-    jax_fwd_err = jnp.quantile(jax_fwd_measurements, quantiles) - jax_fwd_med
-    jax_rev_err = jnp.quantile(jax_rev_measurements, quantiles) - jax_rev_med
+    jax_fwd_err = np.quantile(jax_fwd_measurements, quantiles) - jax_fwd_med
+    jax_rev_err = np.quantile(jax_rev_measurements, quantiles) - jax_rev_med
     
     fig, ax = plt.subplots()
     
     plt.rcParams.update({"font.size": 16})  
     
     modes = ["fwd", "JAX fwd", "rev", "JAX rev", "cc", "mM"]
-    x_pos = jnp.arange(0, len(modes))
-    runtimes = jnp.stack([fwd_med, jax_fwd_med, rev_med, jax_rev_med, cc_med, mM_med])
-    runtime_errors = jnp.stack([fwd_err, jax_fwd_err, rev_err, jax_rev_err, cc_err, mM_err])
+    x_pos = np.arange(0, len(modes))
+    runtimes = np.stack([fwd_med, jax_fwd_med, rev_med, jax_rev_med, cc_med, mM_med])
+    runtime_errors = np.stack([fwd_err, jax_fwd_err, rev_err, jax_rev_err, cc_err, mM_err])
     ax.bar(x_pos, runtimes, yerr=runtime_errors, align="center", alpha=0.5, 
             ecolor="black", color="#6096f6", capsize=10)
     
@@ -234,20 +235,20 @@ def plot_performance_jax_only(f: Callable,
                     args: Sequence[Array],
                     name: str,
                     samplesize: int = 1000,
-                    quantiles: Array = jnp.array([0.025, 0.975]),
+                    quantiles: Array = np.array([0.025, 0.975]),
                     caption: str ="different modes") -> None:
     """
     TODO docstring
     """        
     jax_fwd_measurements, jax_rev_measurements = measure_execution_time_with_jax(f, args, samplesize=samplesize)
             
-    fwd_med = jnp.median(jax_fwd_measurements)
-    rev_med = jnp.median(jax_rev_measurements)
+    fwd_med = np.median(jax_fwd_measurements)
+    rev_med = np.median(jax_rev_measurements)
     
     print(f"fwd median: {fwd_med}, rev median: {rev_med}")
         
-    fwd_err = jnp.quantile(jax_fwd_measurements, quantiles) - fwd_med
-    rev_err = jnp.quantile(jax_rev_measurements, quantiles) - rev_med
+    fwd_err = np.quantile(jax_fwd_measurements, quantiles) - fwd_med
+    rev_err = np.quantile(jax_rev_measurements, quantiles) - rev_med
     
     print(f"fwd err: {fwd_err}, rev err: {rev_err}")
     
@@ -256,9 +257,9 @@ def plot_performance_jax_only(f: Callable,
     plt.rcParams.update({"font.size": 15})  
     
     modes = ["JAX fwd", "JAX rev"]
-    x_pos = jnp.arange(0, len(modes))
-    runtimes = jnp.stack([fwd_med, rev_med])
-    runtime_errors = jnp.stack([fwd_err, rev_err])
+    x_pos = np.arange(0, len(modes))
+    runtimes = np.stack([fwd_med, rev_med])
+    runtime_errors = np.stack([fwd_err, rev_err])
     ax.bar(x_pos, runtimes, yerr=runtime_errors, align="center", alpha=0.5, 
             ecolor="black", color="#6096f6", capsize=10)
     
@@ -282,7 +283,7 @@ def plot_performance_over_size(f: Callable,
                                 task: str,
                                 ticks: Sequence[int] = (2, 4, 8),
                                 samplesize: int = 1000,
-                                quantiles = jnp.array([0.025, 0.975])):
+                                quantiles = np.array([0.025, 0.975])):
     
     cc_medians, cc_errs = [], []
     mM_medians, mM_errs = [], []
@@ -295,35 +296,35 @@ def plot_performance_over_size(f: Callable,
         fwd_measurements = measure_execution_time(f, arg, "fwd", samplesize=samplesize)
         rev_measurements = measure_execution_time(f, arg, "rev", samplesize=samplesize)
                
-        cc_median = jnp.median(cc_measurements)
-        mM_median = jnp.median(mM_order_measurements)
-        fwd_median = jnp.median(fwd_measurements)
-        rev_median = jnp.median(rev_measurements)
+        cc_median = np.median(cc_measurements)
+        mM_median = np.median(mM_order_measurements)
+        fwd_median = np.median(fwd_measurements)
+        rev_median = np.median(rev_measurements)
         
         cc_medians.append(cc_median)
         mM_medians.append(mM_median)
         fwd_medians.append(fwd_median)
         rev_medians.append(rev_median)
                 
-        cc_errs.append(jnp.quantile(cc_measurements, quantiles) - cc_median)
-        mM_errs.append(jnp.quantile(mM_order_measurements, quantiles) - mM_median)
-        fwd_errs.append(jnp.quantile(fwd_measurements, quantiles) - fwd_median)
-        rev_errs.append(jnp.quantile(rev_measurements, quantiles) - rev_median)
+        cc_errs.append(np.quantile(cc_measurements, quantiles) - cc_median)
+        mM_errs.append(np.quantile(mM_order_measurements, quantiles) - mM_median)
+        fwd_errs.append(np.quantile(fwd_measurements, quantiles) - fwd_median)
+        rev_errs.append(np.quantile(rev_measurements, quantiles) - rev_median)
         
-    _arr = jnp.array([[-1.], [1.]])
-    cc_errs = jnp.stack(cc_errs, axis=1)*_arr
-    mM_errs = jnp.stack(mM_errs, axis=1)*_arr
-    fwd_errs = jnp.stack(fwd_errs, axis=1)*_arr
-    rev_errs = jnp.stack(rev_errs, axis=1)*_arr
+    _arr = np.array([[-1.], [1.]])
+    cc_errs = np.stack(cc_errs, axis=1)*_arr
+    mM_errs = np.stack(mM_errs, axis=1)*_arr
+    fwd_errs = np.stack(fwd_errs, axis=1)*_arr
+    rev_errs = np.stack(rev_errs, axis=1)*_arr
     
-    cc_medians = jnp.array(cc_medians)
-    mM_medians = jnp.array(mM_medians)
-    fwd_medians = jnp.array(fwd_medians)
-    rev_medians = jnp.array(rev_medians)
+    cc_medians = np.array(cc_medians)
+    mM_medians = np.array(mM_medians)
+    fwd_medians = np.array(fwd_medians)
+    rev_medians = np.array(rev_medians)
     
     plt.rc("font", family="serif")
     fig, ax = plt.subplots()
-    x_pos = jnp.arange(len(args))
+    x_pos = np.arange(len(args))
     ax.errorbar(x_pos, cc_medians, yerr=cc_errs, label="Graphax + AlphaGrad", 
                 fmt='.-', ecolor="black", elinewidth=1, capsize=3)
     ax.errorbar(x_pos, mM_medians, yerr=mM_errs, label="Graphax Markowitz", 
@@ -354,7 +355,7 @@ def plot_performance_over_size_jax(f: Callable,
                                     task: str,
                                     ticks: Sequence[int] = (2, 4, 8),
                                     samplesize: int = 1000,
-                                    quantiles = jnp.array([0.025, 0.975])):
+                                    quantiles = np.array([0.025, 0.975])):
     
     cc_medians, cc_errs = [], []
     jax_fwd_medians, jax_fwd_errs = [], []
@@ -365,26 +366,26 @@ def plot_performance_over_size_jax(f: Callable,
         
         jax_fwd_measurements, jax_rev_measurements = measure_execution_time_with_jax(f, arg, samplesize=samplesize)
                 
-        cc_median = jnp.median(cc_measurements)
-        jax_fwd_median = jnp.median(jax_fwd_measurements)
-        jax_rev_median = jnp.median(jax_rev_measurements)
+        cc_median = np.median(cc_measurements)
+        jax_fwd_median = np.median(jax_fwd_measurements)
+        jax_rev_median = np.median(jax_rev_measurements)
         
         cc_medians.append(cc_median)
         jax_fwd_medians.append(jax_fwd_median)
         jax_rev_medians.append(jax_rev_median)
                 
-        cc_errs.append(jnp.quantile(cc_measurements, quantiles) - cc_median)
-        jax_fwd_errs.append(jnp.quantile(jax_fwd_measurements, quantiles) - jax_fwd_median)
-        jax_rev_errs.append(jnp.quantile(jax_rev_measurements, quantiles) - jax_rev_median)
+        cc_errs.append(np.quantile(cc_measurements, quantiles) - cc_median)
+        jax_fwd_errs.append(np.quantile(jax_fwd_measurements, quantiles) - jax_fwd_median)
+        jax_rev_errs.append(np.quantile(jax_rev_measurements, quantiles) - jax_rev_median)
         
-    _arr = jnp.array([[-1.], [1.]])
-    jax_fwd_errs = jnp.stack(jax_fwd_errs, axis=1)*_arr
-    jax_rev_errs = jnp.stack(jax_rev_errs, axis=1)*_arr
-    cc_errs = jnp.stack(cc_errs, axis=1)*_arr
+    _arr = np.array([[-1.], [1.]])
+    jax_fwd_errs = np.stack(jax_fwd_errs, axis=1)*_arr
+    jax_rev_errs = np.stack(jax_rev_errs, axis=1)*_arr
+    cc_errs = np.stack(cc_errs, axis=1)*_arr
     
-    jax_fwd_medians = jnp.array(jax_fwd_medians)
-    jax_rev_medians = jnp.array(jax_rev_medians)
-    cc_medians = jnp.array(cc_medians)
+    jax_fwd_medians = np.array(jax_fwd_medians)
+    jax_rev_medians = np.array(jax_rev_medians)
+    cc_medians = np.array(cc_medians)
     
     font = {"family" : "normal",
             "weight" : "normal",
@@ -392,7 +393,7 @@ def plot_performance_over_size_jax(f: Callable,
 
     plt.rc("font", **font)
     fig, ax = plt.subplots()
-    x_pos = jnp.arange(len(args))
+    x_pos = np.arange(len(args))
     ax.errorbar(x_pos, jax_fwd_medians, yerr=jax_fwd_errs, label="JAX forward mode",
                 fmt='.-', ecolor="black", elinewidth=1, capsize=3)
     ax.errorbar(x_pos, jax_rev_medians, yerr=jax_rev_errs, label="JAX reverse mode",
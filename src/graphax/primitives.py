@@ -172,16 +172,24 @@ defelemental(lax.atanh_p, lambda x: 1./(1. - x**2))
 defelemental(lax.erf_p, lambda x: 2.*jnp.exp(-x**2)/jnp.sqrt(jnp.pi))
 
 
-# TODO this can be significantly optimized
-# Currently we are creating a new array of ones everytime. Not smart!
+# NOTE: For equally shaped operands the partials of add/sub are just (signed)
+# identity maps, so a scalar multiple of a Kronecker delta is enough and
+# materializing full arrays of ones would make every downstream multiplication
+# and addition pay for a dense tensor whose values are purely structural.
+# Mismatched shapes, e.g. broadcasts against a rank-0 operand, still need the
+# shaped ones since `make_parallel_jacobian` reads the required output shape
+# off the elemental in these cases.
 def add_elemental_rule(x, y):
+    if get_shape(x) == get_shape(y):
+        return (jnp.ones(()), jnp.ones(()))
     return (jnp.ones_like(y), jnp.ones_like(x))
 defelemental(lax.add_p, add_elemental_rule)
 defelemental(jax._src.ad_util.add_any_p, add_elemental_rule)
 
 
-# TODO this can also be optimized significantly
 def sub_elemental_rule(x, y):
+    if get_shape(x) == get_shape(y):
+        return (jnp.ones(()), -jnp.ones(()))
     return (jnp.ones_like(y), -jnp.ones_like(x))
 defelemental(lax.sub_p, sub_elemental_rule)
 
@@ -911,21 +919,30 @@ def squeeze_elemental_rule(primals, **params):
             counter += 1
             
         out_ids = [d.id for d in new_out_dims]
-        primal_ids = [d.id for d in new_primal_dims]    
+        primal_ids = [d.id for d in new_primal_dims]
         new_val_dims = [d.val_dim for d in new_out_dims if d.val_dim is not None]
         new_val_dims += [d.val_dim for d in new_primal_dims if type(d) is DenseDimension and d.val_dim is not None]
 
+        # Precomputed position tables so that the renumbering below is a O(1)
+        # lookup per dimension instead of a linear `list.index` scan per access
+        out_id_pos = {id: i for i, id in enumerate(out_ids)}
+        primal_id_pos = {id: i for i, id in enumerate(primal_ids)}
+        val_dim_pos = {}
+        for i, val_dim in enumerate(new_val_dims):
+            if val_dim not in val_dim_pos:
+                val_dim_pos[val_dim] = i
+
         for d in new_out_dims:
-            d.id = out_ids.index(d.id)
+            d.id = out_id_pos[d.id]
             if d.val_dim is not None:
-                d.val_dim = new_val_dims.index(d.val_dim)
+                d.val_dim = val_dim_pos[d.val_dim]
             if type(d) is SparseDimension:
                 d.other_id = len(new_out_dims) + new_primal_dims.index(d.other_id)
-                    
+
         for d in new_primal_dims:
-            d.id = len(new_out_dims) + primal_ids.index(d.id)
+            d.id = len(new_out_dims) + primal_id_pos[d.id]
             if d.val_dim is not None:
-                d.val_dim = new_val_dims.index(d.val_dim)
+                d.val_dim = val_dim_pos[d.val_dim]
             if type(d) is SparseDimension:
                 d.other_id = new_out_dims.index(d.other_id)
                     
@@ -155,9 +155,9 @@ class SparseTensor:
         if not self.out_dims and not self.primal_dims:
             return self.val
         
-        shape = _get_fully_materialized_shape(self)   
+        shape = _get_fully_materialized_shape(self)
         val = self.val.reshape(shape) * eye
-        
+
         # Get the tiling for DenseDimensions with `val_dim = None`, i.e. replicating
         # dimensions
         def tile_dim_fn(d: Dimension) -> int:
@@ -167,8 +167,13 @@ class SparseTensor:
                 return 1
 
         tiling = [tile_dim_fn(d) for d in self.out_dims + self.primal_dims]
-        index_map = eye_like_copy(eye_shape, len(self.out_dims), iota)
-        return jnp.tile(index_map*val, tiling)
+        # `eye` has {0, 1} entries, so multiplying with it a second time is a
+        # no-op and would just materialize the full Kronecker tensor twice.
+        # Without replicating dimensions the tiling is all ones and the copy
+        # made by jnp.tile can be skipped entirely.
+        if all(t == 1 for t in tiling):
+            return val
+        return jnp.tile(val, tiling)
         
     def copy(self, val: Array = None):
         """
@@ -213,20 +218,24 @@ def _assert_sparse_tensor_consistency(st: SparseTensor):
     Returns:
         bool: True if the `SparseTensor` object is consistent.
     """
+    # This check runs on every SparseTensor construction, so the dimension
+    # tuple is concatenated only once
+    dims = st.out_dims + st.primal_dims
+
     # Check if d.size matches val.shape[d.val_dim] for all d
     matching_sparse_sizes = all(
         d.size == st.val.shape[d.val_dim]
         or d.size == 1
         if isinstance(d, SparseDimension)
         and d.val_dim is not None else True
-        for d in st.out_dims + st.primal_dims
+        for d in dims
     )
 
     matching_dense_sizes = all(
         d.size == st.val.shape[d.val_dim]
         if isinstance(d, DenseDimension)
         and d.val_dim is not None else True
-        for d in st.out_dims + st.primal_dims
+        for d in dims
     )
 
     matching_sizes = matching_sparse_sizes or matching_dense_sizes
@@ -542,27 +551,23 @@ def _swap_axes(st: SparseTensor) -> SparseTensor:
     Returns:
         SparseTensor: SparseTensor object with appropriately swapped `val` property.
     """
-    transposed_shape = [d.size for d in st.out_dims if isinstance(d, DenseDimension)]
-    transposed_shape += [d.size for d in st.primal_dims if d.val_dim is not None]
-    
-    l = len(st.out_dims)
-    for ld in st.out_dims:
-        # NOTE: not sure if this is a good solution to the problem here:
-        if transposed_shape == _get_val_shape(st):
-            break
-        if isinstance(ld, SparseDimension) and ld.val_dim is not None:
-            new_val_dim = _get_new_val_dim(ld, st)
-            for d in st.out_dims + st.primal_dims:
-                if (d.id != ld.id
-                    and d.id != ld.other_id
-                    and d.val_dim is not None
-                    and ld.val_dim <= d.val_dim <= new_val_dim):
-                    d.val_dim -= 1
-            ld.val_dim = new_val_dim
-            st.primal_dims[ld.other_id-l].val_dim = new_val_dim
+    # The target layout lists the dense out_dims axes first, followed by the
+    # primal_dims axes in order, where each pair of SparseDimensions
+    # contributes its shared axis once. This covers every axis of `val`
+    # exactly once, so the old val_dims in that order directly give the
+    # transpose permutation.
+    permutation = [d.val_dim for d in st.out_dims
+                    if isinstance(d, DenseDimension) and d.val_dim is not None]
+    permutation += [d.val_dim for d in st.primal_dims if d.val_dim is not None]
+
+    new_pos = {old: new for new, old in enumerate(permutation)}
+    dims = st.out_dims + st.primal_dims
+    for d in dims:
+        if d.val_dim is not None:
+            d.val_dim = new_pos[d.val_dim]
 
-    permutation = _get_permutation_from_tensor(st)
-    st.val = jnp.transpose(st.val, permutation)
+    if permutation != list(range(len(permutation))):
+        st.val = jnp.transpose(st.val, permutation)
     return st
 
 
@@ -614,9 +619,13 @@ def _pad_tensors(lhs: SparseTensor, rhs: SparseTensor):
     lhs_shape, rhs_shape = list(lhs.val.shape), list(rhs.val.shape)
     r = len(rhs.out_dims)
     lhs_pad, rhs_pad = _get_padding(lhs.out_dims, rhs.primal_dims)
-    
+    # The loops below only mutate the val_dim properties, so the concatenated
+    # dimension lists can be built once up front
+    lhs_dims = lhs.out_dims + lhs.primal_dims
+    rhs_dims = rhs.out_dims + rhs.primal_dims
+
     ### Update dimension numbers
-    for rd in rhs.out_dims + rhs.primal_dims:
+    for rd in rhs_dims:
         if rd.val_dim is not None:
             if isinstance(rd, DenseDimension):
                 rd.val_dim += len(rhs_pad)
@@ -644,7 +653,7 @@ def _pad_tensors(lhs: SparseTensor, rhs: SparseTensor):
             ld.val_dim = other_val_dim
             lhs.out_dims[ld.other_id].val_dim = other_val_dim
 
-            for d in lhs.out_dims + lhs.primal_dims:
+            for d in lhs_dims:
                 if (d.id != ld.id
                     and d.id != ld.other_id
                     and d.val_dim is not None
@@ -662,7 +671,7 @@ def _pad_tensors(lhs: SparseTensor, rhs: SparseTensor):
             rd.val_dim = new_val_dim
             rhs.primal_dims[rd.other_id-r].val_dim = new_val_dim
 
-            for d in rhs.out_dims + rhs.primal_dims:
+            for d in rhs_dims:
                 if (d.id != rd.id
                     and d.id != rd.other_id
                     and d.val_dim is not None
@@ -676,7 +685,7 @@ def _pad_tensors(lhs: SparseTensor, rhs: SparseTensor):
             lhs_shape.insert(new_val_dim, 1)
             ld.val_dim = new_val_dim
 
-            for d in lhs.out_dims + lhs.primal_dims:
+            for d in lhs_dims:
                 if d.id != ld.id:
                     if d.val_dim is not None and d.val_dim >= new_val_dim:
                         d.val_dim += 1
@@ -691,7 +700,7 @@ def _pad_tensors(lhs: SparseTensor, rhs: SparseTensor):
             rhs_shape.insert(new_val_dim, 1)
             rd.val_dim = new_val_dim
 
-            for d in rhs.out_dims + rhs.primal_dims:
+            for d in rhs_dims:
                 if (d.id != rd.id
                     and d.val_dim is not None
                     and d.val_dim >= new_val_dim):
@@ -961,7 +970,9 @@ def _replicate_along_axis(st: SparseTensor, ids: Sequence[int]) -> SparseTensor:
                     else:
                         tiling.append(1)
 
-    st.val = jnp.tile(st.val, tiling)
+    # If all entries are one, the tiling would just copy the whole buffer
+    if any(t > 1 for t in tiling):
+        st.val = jnp.tile(st.val, tiling)
 
     return st
 
@@ -1147,8 +1158,8 @@ def _mixed_mul(lhs: SparseTensor, rhs: SparseTensor) -> SparseTensor:
                     else:
                         val_dim = rd.val_dim \
                                 - sum([1 for rc in rcontracting_axes if rc < rd.val_dim]) \
-                                + lhs.val.ndim - sum([1 for lc in lcontracting_axes]) \
-                                - sum([1 for lb in lbroadcasting_axes])
+                                + lhs.val.ndim - len(lcontracting_axes) \
+                                - len(lbroadcasting_axes)
                     new_out_dims.insert(ld.id, DenseDimension(ld.other_id, ld.size, val_dim))
                 elif isinstance(ld, DenseDimension):
                     # rd sparse
@@ -1156,7 +1167,7 @@ def _mixed_mul(lhs: SparseTensor, rhs: SparseTensor) -> SparseTensor:
                     if rd.val_dim is not None:
                         val_dim = rd.val_dim \
                                 - sum([1 for rc in rcontracting_axes if rc < rd.val_dim]) \
-                                + lhs.val.ndim - sum([1 for lc in lcontracting_axes])
+                                + lhs.val.ndim - len(lcontracting_axes)
                     else:
                         val_dim = ld.val_dim \
                                 - sum([1 for lc in lcontracting_axes if lc < ld.val_dim])
@@ -1168,8 +1179,8 @@ def _mixed_mul(lhs: SparseTensor, rhs: SparseTensor) -> SparseTensor:
                     elif rd.val_dim is not None:
                         val_dim = rd.val_dim \
                                 - sum([1 for rc in rcontracting_axes if rc < rd.val_dim]) \
-                                + lhs.val.ndim - sum([1 for lc in lcontracting_axes]) \
-                                - sum([1 for lb in lbroadcasting_axes])
+                                + lhs.val.ndim - len(lcontracting_axes) \
+                                - len(lbroadcasting_axes)
                     new_out_dims.insert(ld.other_id, SparseDimension(ld.other_id, ld.size, val_dim, rd.other_id-r+l))
                     new_primal_dims.insert(rd.other_id-r, SparseDimension(rd.other_id-r+l, ld.size, val_dim, ld.other_id))
                     
@@ -1197,21 +1208,23 @@ def _mixed_mul(lhs: SparseTensor, rhs: SparseTensor) -> SparseTensor:
                 val_dim = sum([1 for d in new_out_dims[:ld.id] if d.val_dim is not None])
             new_out_dims.insert(ld.id, DenseDimension(ld.id, ld.size, ld.val_dim))
     
+    # TODO add documentation here
+    # These counts do not depend on the loop variable, so they are computed
+    # once instead of for every DenseDimension in rhs.primal_dims
+    num_old_lhs_out_dims = sum([1 for ld in lhs.out_dims
+                                if isinstance(ld, DenseDimension) \
+                                    and ld.val_dim is not None])
+    num_old_rhs_out_dims = sum([1 for rd in rhs.out_dims \
+                                if rd.val_dim is not None])
+    num_sparse_dims = sum([1 for ld, rd in zip(lhs.primal_dims, rhs.out_dims)
+                           if (isinstance(ld, SparseDimension) \
+                               or isinstance(rd, SparseDimension)) \
+                               and (ld.val_dim is not None \
+                                or rd.val_dim is not None)])
     for rd in rhs.primal_dims:
         if isinstance(rd, DenseDimension):
             val_dim = None
             if rd.val_dim is not None:
-                # TODO add documentation here
-                num_old_lhs_out_dims = sum([1 for ld in lhs.out_dims 
-                                            if isinstance(ld, DenseDimension) \
-                                                and ld.val_dim is not None])
-                num_old_rhs_out_dims = sum([1 for rd in rhs.out_dims \
-                                            if rd.val_dim is not None])
-                num_sparse_dims = sum([1 for ld, rd in zip(lhs.primal_dims, rhs.out_dims) 
-                                       if (isinstance(ld, SparseDimension) \
-                                           or isinstance(rd, SparseDimension)) \
-                                           and (ld.val_dim is not None \
-                                            or rd.val_dim is not None)])
                 val_dim = rd.val_dim + num_old_lhs_out_dims + num_sparse_dims - num_old_rhs_out_dims
             new_primal_dims.insert(rd.id-r, DenseDimension(rd.id-r+l, rd.size, val_dim))
 
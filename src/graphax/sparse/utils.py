@@ -89,10 +89,11 @@ def eye_like_copy(shape: Sequence[int], out_len: int, iota: jnp.ndarray) -> jnp.
             return jnp.ones(tuple(out_shape)+(1,))
         else:
             if iota.shape[0] < out_size or iota.shape[1] < primal_size:
-                iota = jnp.eye(max(out_size, primal_size))
+                # `iota` is too small, so the Kronecker delta is built directly
+                # in the required size instead of slicing an oversized eye
+                sub_iota = jnp.eye(out_size, primal_size)
             else:
-                iota = lax.slice(iota, (0, 0), (out_size, primal_size))
-            sub_iota = lax.slice(iota, (0, 0), (out_size, primal_size))
+                sub_iota = lax.slice(iota, (0, 0), (out_size, primal_size))
             return sub_iota.reshape(*shape)
     else:
         # This piece of code creates a proper higher order tensor as that is a
@@ -53,7 +53,47 @@ class GeneralADTest(unittest.TestCase):
         print(veres)
         print(revres)
         self.assertTrue(tree_allclose(veres, revres))
-        
+
+    def test_scalar_broadcast_add(self):
+        def scalar_add(x, y):
+            return jnp.tanh(x + y)
+
+        x = 2*jnp.ones((2, 3))
+        y = jnp.array(3.)
+        print(jax.make_jaxpr(scalar_add)(x, y))
+        print(jax.make_jaxpr(jacve(scalar_add, order="fwd", argnums=(0, 1)))(x, y))
+        jac_rev = jax.jit(jacve(scalar_add, order="fwd", argnums=(0, 1)))
+        veres = jac_rev(x, y)
+
+        print(jax.make_jaxpr(jax.jacfwd(scalar_add, argnums=(0, 1)))(x, y))
+        jax_jac_rev = jax.jit(jax.jacfwd(scalar_add, argnums=(0, 1)))
+        revres = jax_jac_rev(x, y)
+
+        print(veres)
+        print(revres)
+        self.assertTrue(tree_allclose(veres, revres))
+
+    def test_scalar_broadcast_sub(self):
+        # Mimics the layer_norm pattern where the subtrahend is a traced
+        # rank-0 intermediate
+        def scalar_sub(x, y):
+            return jnp.tanh(x - jnp.mean(y))
+
+        x = 2*jnp.ones((2, 3))
+        y = 3*jnp.ones((2, 3))
+        print(jax.make_jaxpr(scalar_sub)(x, y))
+        print(jax.make_jaxpr(jacve(scalar_sub, order="fwd", argnums=(0, 1)))(x, y))
+        jac_rev = jax.jit(jacve(scalar_sub, order="fwd", argnums=(0, 1)))
+        veres = jac_rev(x, y)
+
+        print(jax.make_jaxpr(jax.jacfwd(scalar_sub, argnums=(0, 1)))(x, y))
+        jax_jac_rev = jax.jit(jax.jacfwd(scalar_sub, argnums=(0, 1)))
+        revres = jax_jac_rev(x, y)
+
+        print(veres)
+        print(revres)
+        self.assertTrue(tree_allclose(veres, revres))
+
     def test_broadcast_mul(self):
         def broadcast_mul(x, y):
             z = jnp.exp(y)